@@ -1,23 +1,81 @@
-import nest_asyncio
-nest_asyncio.apply()  # Enable nested event loops (helps in interactive environments)
-
-import ccxt
+import ccxt.async_support
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import mplfinance as mpf
-import schedule
+from numba import njit
 import time
+from io import BytesIO
 from telegram import Bot, BotCommand, InlineKeyboardMarkup, InlineKeyboardButton
 from telegram.ext import CommandHandler, Application, CallbackQueryHandler
 from pytz import utc
 import asyncio
-import threading
 
 # Configure matplotlib to use a monospace font
 plt.rcParams["font.family"] = "monospace"
 
 
+@njit(cache=True, fastmath=True)
+def _ao_update_kernel(high, low, ao, sign, start, s, l):
+    """
+    Recompute the Awesome Oscillator and its sign in place from bar start onwards.
+
+    Both SMAs of the median price are maintained as running sums: they are seeded from the
+    bars just before start, then each bar adds its median price and, once the window is full,
+    subtracts the one that fell out of it. Bars before start are left untouched, so refreshing
+    the newest bars costs O(l + new bars) rather than a pass over the whole array.
+
+    :param high: NumPy array of High prices.
+    :param low: NumPy array of Low prices.
+    :param ao: Float array receiving the oscillator; NaN until the long window is filled.
+    :param sign: int8 array receiving the oscillator sign; 0 until the long window is filled.
+    :param start: Index of the first bar to recompute.
+    :param s: Window size for the short SMA.
+    :param l: Window size for the long SMA.
+    """
+    n = high.shape[0]
+    sum_s = 0.0
+    sum_l = 0.0
+    for j in range(max(0, start - l), start):
+        m = 0.5 * (high[j] + low[j])
+        sum_l += m
+        if j >= start - s:
+            sum_s += m
+    for i in range(start, n):
+        m = 0.5 * (high[i] + low[i])
+        sum_s += m
+        sum_l += m
+        if i >= s:
+            sum_s -= 0.5 * (high[i - s] + low[i - s])
+        if i >= l:
+            sum_l -= 0.5 * (high[i - l] + low[i - l])
+        if i >= l - 1 and i >= s - 1:
+            value = sum_s / s - sum_l / l
+            ao[i] = value
+            sign[i] = (value > 0) - (value < 0)
+        else:
+            ao[i] = np.nan
+            sign[i] = 0
+
+
+@njit(cache=True, fastmath=True)
+def _ao_kernel(high, low, s=5, l=34):
+    """
+    Compute the Awesome Oscillator and its sign in a single pass over the High/Low arrays.
+
+    :param high: NumPy array of High prices.
+    :param low: NumPy array of Low prices.
+    :param s: Window size for the short SMA (default is 5).
+    :param l: Window size for the long SMA (default is 34).
+    :return: Tuple (ao, sign); ao is NaN and sign is 0 until the long window is filled.
+    """
+    n = high.shape[0]
+    ao = np.empty(n, dtype=np.float64)
+    sign = np.zeros(n, dtype=np.int8)
+    _ao_update_kernel(high, low, ao, sign, 0, s, l)
+    return ao, sign
+
+
 class fib_ao_strategy:
     """
     A trading alert bot that uses the Awesome Oscillator and Fibonacci retracement levels
@@ -32,6 +90,14 @@ class fib_ao_strategy:
       - Provides an interactive Telegram bot interface for chart requests, help, and pausing alerts.
     """
 
+    # Fixed attribute layout: no per-instance __dict__, and faster lookups in the strategy loop.
+    __slots__ = (
+        "symbol", "timeframe", "ex", "_mpf_style", "_fig", "_ax", "_chart_cache", "_chart_cache_key",
+        "ret_limits", "fib_numbers", "_fib_arr", "bot", "_sent_mask", "last_candle_start_time",
+        "_last_ts", "alerts_enabled", "data", "ret_list", "ret_series", "cur_price", "chat_id",
+        "_lim_down", "_lim_up", "_lim_labels", "_lim_ratios", "_ticker_cache", "_np",
+    )
+
     def __init__(self, info_file_path):
         """
         Initialize the fib_ao_strategy instance using configuration from a file.
@@ -43,8 +109,8 @@ class fib_ao_strategy:
           - token_id: Telegram bot token.
 
         Sets up:
-          - CCXT exchange connection for data retrieval.
-          - The matplotlib figure holder.
+          - Asynchronous CCXT exchange connection for data retrieval.
+          - The persistent chart figure/axes and the rendered chart cache.
           - Telegram Bot for alerts.
           - Alert tracking attributes.
           - The timestamp of the last candle to manage alert repetition.
@@ -52,21 +118,24 @@ class fib_ao_strategy:
         :param info_file_path: Path to the configuration text file.
         """
         with open(info_file_path, 'r') as info:
-            information = info.readlines()
-        settings = {}
-        for line in information:
-            if '=' in line:
-                key, value = line.strip().split('=', 1)
-                settings[key] = value
+            settings = dict(line.strip().split('=', 1) for line in info if '=' in line)
         self.symbol = settings["symbol"]
         self.timeframe = settings["timeframe"]
-        self.ex = ccxt.gate()
-        self.fig = None
+        self.ex = ccxt.async_support.gate()
+        # Chart style resolved once, and a persistent chart figure redrawn in place on every render.
+        self._mpf_style = mpf.make_mpf_style(base_mpf_style='charles')
+        self._fig = mpf.figure(style=self._mpf_style, figsize=(15, 8))
+        self._ax = self._fig.add_subplot(1, 1, 1)
+        self._chart_cache = None  # PNG bytes of the last rendered chart.
+        self._chart_cache_key = None  # (candle start, last close, levels) the cached chart was rendered for.
         self.ret_limits = None
         self.fib_numbers = [0, 0.236, 0.382, 0.5, 0.618, 0.786, 1, 1.414, 1.618]
+        self._fib_arr = np.array(self.fib_numbers, dtype=np.float64)
         self.bot = Bot(token=settings["token_id"])
-        self.sent_alerts = set()  # Tracks which alerts have been sent for the current candle period.
+        self._sent_mask = 0  # Bit i is set once level i has alerted in the current candle period.
         self.last_candle_start_time = None  # Timestamp for the start of the last candle.
+        self._last_ts = None  # Exchange timestamp (ms) of the newest candle in self.data.
+        self._ticker_cache = (0.0, None)  # (monotonic time, price) of the last ticker fetch.
         self.alerts_enabled = True  # Flag to control whether alerts are active.
 
     def __repr__(self):
@@ -79,48 +148,93 @@ class fib_ao_strategy:
         """
         return f"fib_ao_strategy(symbol='{self.symbol}', timeframe='{self.timeframe}')"
 
-    def get_data(self):
+    async def get_data(self):
         """
         Fetch and process the latest OHLCV market data.
 
         Workflow:
-          - Retrieves raw OHLCV data from the exchange for the specified symbol and timeframe.
+          - Retrieves raw OHLCV data from the exchange for the specified symbol and timeframe:
+            the last 200 candles on the first call, afterwards only the candles since the newest stored one.
           - Converts the data into a pandas DataFrame with a datetime index.
-          - Drops unnecessary columns and updates the class variable with the new data.
-          - Checks if a new candle has started; if so, resets the alert tracking set.
+          - Appends the new candles to the stored ones, keeping a 200-candle window, and updates the class variable.
+          - Checks if a new candle has started; if so, resets the alert tracking mask.
           - Calculates technical indicators: Awesome Oscillator (ao) and Fibonacci levels.
-          - Updates Fibonacci retracement limits and finally draws a candlestick chart with these levels.
+          - Updates Fibonacci retracement limits and finally renders (and caches) a candlestick chart with these levels.
         """
         exchange = self.ex
-        raw = exchange.fetch_ohlcv(self.symbol, self.timeframe, limit=200)
-        data = pd.DataFrame(raw, columns=["Time", "Open", "High", "Low", "Close", "Volume"])
-        data.set_index(pd.to_datetime(data["Time"], unit="ms"), inplace=True)
-        data.drop(["Time", "Volume"], axis=1, inplace=True)
+        window = 200
+        ao_start = 0
+        if self._last_ts is None:
+            raw = await exchange.fetch_ohlcv(self.symbol, self.timeframe, limit=window)
+            data = self._ohlcv_frame(raw)
+        else:
+            # Re-fetch from the newest stored candle on, since it was still forming when it was fetched.
+            raw = await exchange.fetch_ohlcv(self.symbol, self.timeframe, since=self._last_ts, limit=window)
+            if not raw:
+                return
+            if len(raw) == window:
+                # Too far behind to patch the buffer; reload the latest window instead.
+                raw = await exchange.fetch_ohlcv(self.symbol, self.timeframe, limit=window)
+                data = self._ohlcv_frame(raw)
+            else:
+                new_data = self._ohlcv_frame(raw)
+                kept = self.data.loc[self.data.index < new_data.index[0]]
+                data = pd.concat([kept, new_data]).iloc[-window:]
+                # Kept candles keep their indicator values; AO is only recomputed from the first new one.
+                ao_start = len(data) - len(new_data)
+        self._last_ts = int(raw[-1][0])
         self.data = data
+        # NumPy views of the price columns, shared by the indicator methods until the next refresh.
+        self._np = {column: data[column].to_numpy() for column in ("Open", "High", "Low", "Close")}
 
         # For 4h candles: if a new candle has started, reset sent alerts.
         latest_candle_time = data.index[-1]
         if self.last_candle_start_time is None or latest_candle_time != self.last_candle_start_time:
             self.last_candle_start_time = latest_candle_time
-            self.sent_alerts.clear()
+            self._sent_mask = 0
 
         # Calculate required indicators and charts
-        self.ao()
-        self.fibonacci(self.fib_numbers)
+        self.ao(start=ao_start)
+        self.fibonacci(self._fib_arr)
         self.define_limits()  # Ensure ret_limits is updated before strategy runs.
-        self.draw_chart()
+        self._render_chart_png()
+
+    def _ohlcv_frame(self, raw):
+        """
+        Convert raw OHLCV rows from the exchange into a DataFrame.
 
-    def fetch_ticker(self):
+        :param raw: List of [Time, Open, High, Low, Close, Volume] rows as returned by fetch_ohlcv.
+        :return: A DataFrame with Open, High, Low and Close columns and a datetime index.
+        """
+        rows = np.asarray(raw, dtype=np.float64)
+        # Timestamps are integer milliseconds, so view them as datetime64[ms] instead of parsing them.
+        times = rows[:, 0].astype("int64").view("datetime64[ms]")
+        # Only the price columns are taken, so there is nothing to drop afterwards.
+        return pd.DataFrame(
+            rows[:, 1:5],
+            columns=["Open", "High", "Low", "Close"],
+            index=pd.DatetimeIndex(times, name="Time"),
+        )
+
+    async def fetch_ticker(self):
         """
         Retrieve the current market ticker price for the configured symbol.
 
+        The price is cached for one second, so bursts of calls (e.g. /chart right after an
+        alert tick) share a single exchange request.
+
         :return: The last traded price as reported by the exchange.
         """
+        now = time.monotonic()
+        fetched_at, price = self._ticker_cache
+        if now - fetched_at < 1.0 and price is not None:
+            return price
         exchange = self.ex
-        self.cur_price = exchange.fetch_ticker(self.symbol)["last"]
+        self.cur_price = (await exchange.fetch_ticker(self.symbol))["last"]
+        self._ticker_cache = (now, self.cur_price)
         return self.cur_price
 
-    def ao(self, sma_s=5, sma_l=34):
+    def ao(self, sma_s=5, sma_l=34, start=0):
         """
         Calculate the Awesome Oscillator (AO) indicator from the market data.
 
@@ -129,21 +243,33 @@ class fib_ao_strategy:
           - Calculates two simple moving averages (SMA): a short-term (sma_s) and a long-term (sma_l).
           - Determines the Awesome Oscillator as the difference between these two SMAs.
           - Derives the sign of the oscillator for further analysis (stored as 'ao_sign').
-          - Updates the internal DataFrame with new columns ('awesome_osc' and 'ao_sign').
+          - All of the above runs in one pass through the JIT-compiled AO kernels.
+          - Updates the internal DataFrame with new columns ('awesome_osc' and 'ao_sign') and keeps the
+            same arrays in the NumPy column cache for fibonacci().
 
         :param sma_s: Window size for the short SMA (default is 5).
         :param sma_l: Window size for the long SMA (default is 34).
+        :param start: Index of the first bar to recompute; earlier bars keep their existing values
+                      (default is 0, recompute everything).
         """
         try:
-            data = self.data.copy()
-            median_price = (data["High"] + data["Low"]) / 2
-            sma_short = median_price.rolling(window=sma_s).mean()
-            sma_long = median_price.rolling(window=sma_l).mean()
-            awesome_osc = sma_short - sma_long
-            ao_sign = np.sign(awesome_osc)
-            data["awesome_osc"] = awesome_osc
-            data["ao_sign"] = ao_sign
-            self.data = data.copy()
+            high = self._np["High"]
+            low = self._np["Low"]
+            if start > 0 and "awesome_osc" in self.data:
+                # Only the newest bars changed: reuse the stored values and update the tail in place.
+                awesome_osc = self.data["awesome_osc"].to_numpy(dtype=np.float64, copy=True)
+                ao_sign = np.nan_to_num(self.data["ao_sign"].to_numpy(dtype=np.float64)).astype(np.int8)
+                # The oldest bars may have been trimmed, so the first bars lack a full window again.
+                warmup = max(sma_s, sma_l) - 1
+                awesome_osc[:warmup] = np.nan
+                ao_sign[:warmup] = 0
+                _ao_update_kernel(high, low, awesome_osc, ao_sign, start, sma_s, sma_l)
+            else:
+                awesome_osc, ao_sign = _ao_kernel(high, low, sma_s, sma_l)
+            self._np["awesome_osc"] = awesome_osc
+            self._np["ao_sign"] = ao_sign
+            self.data["awesome_osc"] = awesome_osc
+            self.data["ao_sign"] = ao_sign
         except Exception:
             print("⚠️ Please run get_data() first!")
 
@@ -152,7 +278,7 @@ class fib_ao_strategy:
         Calculate Fibonacci retracement levels based on recent oscillation swings.
 
         Process:
-          - Marks changes in the 'ao_sign' column to detect swing points.
+          - Marks changes in the 'ao_sign' array to detect swing points.
           - Selects the three most recent swing points.
           - Determines whether the move (swing) was ascending or descending based on the median of the second segment.
           - Computes Fibonacci levels by interpolating between the calculated high and low based on the provided ratios.
@@ -160,57 +286,74 @@ class fib_ao_strategy:
 
         :param fib_levels: List or array of Fibonacci ratio values (e.g., [0, 0.236, 0.382, 0.5, 0.618, 0.786, 1]).
         :return: A list of calculated Fibonacci retracement price levels.
-        :raises ValueError: If the trend direction cannot be determined.
+        :raises ValueError: If there are too few swings or the trend direction cannot be determined.
         """
-        data = self.data.copy()
-        # Identify swing points where the sign of 'ao_sign' changes.
-        data['chunks'] = (data['ao_sign'] != data['ao_sign'].shift(1)).astype(int).shift(-1)
-        filtered_data_time = data[data["chunks"] != 0].dropna().iloc[-4:-1].index
-        first_chunk, second_chunk, third_chunk = filtered_data_time[0], filtered_data_time[1], filtered_data_time[2]
-        if data.loc[second_chunk:third_chunk, "ao_sign"].median() == 1:
+        arrays = self._np
+        ao_sign = arrays["ao_sign"]
+        high_prices = arrays["High"]
+        low_prices = arrays["Low"]
+        # Identify swing points: the last bar before 'ao_sign' changes, ignoring the AO warm-up bars.
+        valid = ~np.isnan(arrays["awesome_osc"])
+        swings = np.flatnonzero((ao_sign[:-1] != ao_sign[1:]) & valid[:-1])[-4:-1]
+        if len(swings) < 3:
+            raise ValueError("Not enough swings to calculate Fibonacci levels!")
+        first_chunk, second_chunk, third_chunk = swings
+        median_sign = np.median(ao_sign[second_chunk:third_chunk + 1])
+        if median_sign == 1:
             # Descending scenario.
-            low = data.loc[first_chunk:second_chunk, "Low"].min()
-            high = data.loc[second_chunk:third_chunk, "High"].max()
+            low = low_prices[first_chunk:second_chunk + 1].min()
+            high = high_prices[second_chunk:third_chunk + 1].max()
             side = "desc"
-        elif data.loc[second_chunk:third_chunk, "ao_sign"].median() == -1:
+        elif median_sign == -1:
             # Ascending scenario.
-            high = data.loc[first_chunk:second_chunk, "High"].max()
-            low = data.loc[first_chunk:second_chunk, "Low"].min()
+            high = high_prices[first_chunk:second_chunk + 1].max()
+            low = low_prices[first_chunk:second_chunk + 1].min()
             side = "asc"
         else:
             raise ValueError("Something went wrong calculating Fibonacci levels!")
-        ret = []
+        levels = np.asarray(fib_levels, dtype=np.float64)
         # Calculate retracement levels based on trend direction.
         if side == "asc":
-            for i in fib_levels:
-                ret.append(high - (high - low) * i)
+            ret = high - (high - low) * levels
         elif side == "desc":
-            for i in fib_levels:
-                ret.append(high - (high - low) * (1 - i))
+            ret = high - (high - low) * (1 - levels)
         else:
             raise ValueError("'side' should be either 'asc' or 'desc'")
-        fib_ret = pd.Series(data=ret, index=fib_levels)
-        self.ret_list = ret
+        fib_ret = pd.Series(data=ret, index=levels)
+        self.ret_list = ret.tolist()
         self.ret_series = fib_ret
 
 
-    def draw_chart(self):
+    def _render_chart_png(self):
         """
-        Draws real-time chart with Fibonacci retracement horizontal lines.
+        Render the real-time chart with Fibonacci retracement horizontal lines as PNG bytes.
+
+        The chart is drawn onto a figure created once in __init__, so only the axes contents are
+        rebuilt. The rendered image is cached and reused until the last candle, its close, or the
+        Fibonacci levels change, so repeated /chart requests skip mplfinance entirely.
+
+        :return: The chart image encoded as PNG bytes.
         """
-        # Use mplfinance to draw the candlestick chart with horizontal lines.
-        data = self.data.copy()
+        data = self.data
         fib_rets = self.ret_list
-        self.fig, axes = mpf.plot(
-                            data[["Open", "High", "Low", "Close"]],
-                            type='candle',
-                            style='charles',
-                            figsize=(15, 8),
-                            title=f"{self.symbol} {self.timeframe} with Fibonacci ret. levels",
-                            hlines=fib_rets,
-                            returnfig=True
-                            )
-        plt.close(self.fig)
+        key = (self.last_candle_start_time, self._np["Close"][-1], tuple(fib_rets))
+        if key == self._chart_cache_key and self._chart_cache is not None:
+            return self._chart_cache
+        # Use mplfinance to redraw the candlestick chart with horizontal lines on the persistent axes.
+        self._ax.cla()
+        mpf.plot(
+            data[["Open", "High", "Low", "Close"]],
+            type='candle',
+            style=self._mpf_style,
+            ax=self._ax,
+            axtitle=f"{self.symbol} {self.timeframe} with Fibonacci ret. levels",
+            hlines=fib_rets,
+        )
+        buf = BytesIO()
+        self._fig.savefig(buf, format='png')
+        self._chart_cache = buf.getvalue()
+        self._chart_cache_key = key
+        return self._chart_cache
 
     def define_limits(self):
         """
@@ -219,18 +362,24 @@ class fib_ao_strategy:
         For each Fibonacci level, computes:
           - A lower limit (0.4% below the level).
           - An upper limit (0.4% above the level).
-        These bands are stored in a pandas DataFrame (self.ret_limits) and later used by the strategy
-        to determine when to send an alert.
+        These bands are stored in a pandas DataFrame (self.ret_limits) and, sorted by price, as NumPy
+        arrays that the strategy searches to determine when to send an alert.
         """
-        data = self.data.copy()
         ret_series = self.ret_series
-        ret_limits = pd.DataFrame()
-        ret_limits["fib_rets"] = ret_series
-        ret_limits["limit_down"] = ret_series - (ret_series * 0.004)
-        ret_limits["limit_up"] = ret_series + (ret_series * 0.004)
-        self.ret_limits = ret_limits.copy()
-
-    def strategy(self, update=None):
+        self.ret_limits = pd.DataFrame({
+            "fib_rets": ret_series,
+            "limit_down": ret_series - (ret_series * 0.004),
+            "limit_up": ret_series + (ret_series * 0.004),
+        })
+        # Bands sorted by price so strategy() can locate the current price with a binary search.
+        # Each band is labelled with its level's position, which is also its bit in the alert mask.
+        order = np.argsort(self.ret_limits["fib_rets"].to_numpy(), kind="stable")
+        self._lim_down = self.ret_limits["limit_down"].to_numpy()[order]
+        self._lim_up = self.ret_limits["limit_up"].to_numpy()[order]
+        self._lim_labels = order
+        self._lim_ratios = self.ret_limits.index.to_numpy()[order]
+
+    async def strategy(self, update=None):
         """
         Execute the alert strategy based on current market price in relation to Fibonacci levels.
 
@@ -241,6 +390,7 @@ class fib_ao_strategy:
             around any Fibonacci level.
           - For each matched Fibonacci level (that has not already triggered an alert for the current candle),
             outputs an alert message and marks that level as alerted.
+          - Sends the alert messages of the tick to Telegram concurrently.
           - If data is not ready, notifies the user to run /getdata.
 
         :param update: Optional parameter from Telegram update context (not used in background alerts).
@@ -249,28 +399,37 @@ class fib_ao_strategy:
         if not self.alerts_enabled:
             return
     
-        cur_price = self.fetch_ticker()
+        cur_price = await self.fetch_ticker()
         try:
             if self.ret_limits is not None and not self.ret_limits.empty:
-                ret_limits = self.ret_limits.copy()
-                limit_check = ret_limits[
-                    (ret_limits["limit_up"] > cur_price) &
-                    (ret_limits["limit_down"] < cur_price)
-                ].index
-                if not limit_check.empty:
-                    for idx in limit_check:
-                        if idx not in self.sent_alerts:
-                            message = f"💡 Alert! Current price: {cur_price} for Fibonacci level {idx} 🔔"
-                            print(message)
-                            self.sent_alerts.add(idx)
-                            # If chat_id and bot_loop are available, send the Telegram message.
-                            if hasattr(self, 'chat_id') and hasattr(self, 'bot_loop'):
-                                asyncio.run_coroutine_threadsafe(
-                                    self.bot.send_message(chat_id=self.chat_id, text=message, parse_mode='Markdown'),
-                                    self.bot_loop
-                                )
-                            else:
-                                print("No chat_id or bot_loop available. Ensure /start is executed in Telegram.")
+                # Bind the per-tick state to locals once instead of looking it up in the loop.
+                sent_mask = self._sent_mask
+                labels = self._lim_labels
+                ratios = self._lim_ratios
+                bot = self.bot
+                chat_id = getattr(self, 'chat_id', None)
+                # Both band edges grow with the level, so the bands containing the price are a
+                # contiguous run: from the first with limit_up above it to the last with limit_down below it.
+                first = np.searchsorted(self._lim_up, cur_price, side="right")
+                last = np.searchsorted(self._lim_down, cur_price, side="left")
+                messages = []
+                for i in range(first, last):
+                    level = int(labels[i])
+                    if not (sent_mask >> level) & 1:
+                        message = f"💡 Alert! Current price: {cur_price} for Fibonacci level {ratios[i]} 🔔"
+                        print(message)
+                        sent_mask |= 1 << level
+                        messages.append(message)
+                self._sent_mask = sent_mask
+                if messages:
+                    # If chat_id is available, send all of this tick's Telegram messages together.
+                    if chat_id is not None:
+                        await asyncio.gather(*[
+                            bot.send_message(chat_id=chat_id, text=message, parse_mode='Markdown')
+                            for message in messages
+                        ])
+                    else:
+                        print("No chat_id available. Ensure /start is executed in Telegram.")
             else:
                 print("💬 Please wait until data is ready! (Hint: Run /getdata if needed.)")
         except Exception as e:
@@ -291,111 +450,18 @@ class fib_ao_strategy:
         Additionally:
           - Handles inline keyboard button presses via a callback.
           - Registers commands with Telegram for an improved interactive experience.
-          - Runs the polling loop in an asyncio event loop.
+          - Runs the polling loop in the main thread; the initial data fetch, the data refresh and the
+            alert strategy run as tasks on the same asyncio event loop.
+          - Closes the exchange connection when polling stops.
         """
-        async def run_async():
-            application = Application.builder().token(self.bot.token).build()
-    
-            # Save the running event loop for later use
-            self.bot_loop = asyncio.get_running_loop()
-    
-            # /start: Welcome message with menu inline keyboard.
-            async def start(update, context):
-                # Save the user's chat id for later alert messages.
-                self.chat_id = update.effective_message.chat_id
-                if not self.alerts_enabled:
-                    self.alerts_enabled = True
-                    await update.effective_message.reply_text("🚀 Alerts resumed!", parse_mode="Markdown")
-                else:
-                    welcome_message = (
-                        "👋 Hello there! I'm your friendly market alert bot.\n\n"
-                        "What I can do:\n"
-                        "• Provide market data & alerts based on the Awesome Oscillator & Fibonacci levels 📈\n"
-                        "• Generate detailed candlestick charts enriched with Fibonacci retracement levels 🖼️\n"
-                        "• Display a current market snapshot including ticker, symbol, timeframe and time ⏰\n\n"
-                        "Select a command below:"
-                    )
-                    keyboard = [
-                        [InlineKeyboardButton("Chart 📈", callback_data="chart"),
-                         InlineKeyboardButton("Help 🧐", callback_data="help")],
-                        [InlineKeyboardButton("Stop 🚫", callback_data="stop")]
-                    ]
-                    reply_markup = InlineKeyboardMarkup(keyboard)
-                    await update.effective_message.reply_text(welcome_message, parse_mode="Markdown", reply_markup=reply_markup)
-    
-            # /help: Display help information.
-            async def help_handler(update, context):
-                help_text = (
-                    "🤖 *Market Alert Bot Help:*\n\n"
-                    "/start - Start/resume alerts and view available features 😊\n"
-                    "/help - Show this help message and list features 🧐\n"
-                    "/chart - Get the current market chart image 🖼️\n"
-                    "/stop - Pause alerts 🚫\n\n"
-                    "I'm here to fetch market data, compute technical indicators, and alert you when "
-                    "conditions are met. Choose a button from the menu or type a command!"
-                )
-                keyboard = [
-                    [InlineKeyboardButton("Chart 📈", callback_data="chart"),
-                     InlineKeyboardButton("Stop 🚫", callback_data="stop")]
-                ]
-                reply_markup = InlineKeyboardMarkup(keyboard)
-                await update.effective_message.reply_text(help_text, parse_mode="Markdown", reply_markup=reply_markup)
-
-            # /chart: Generate and send the current chart.
-            async def chart(update, context):
-                from io import BytesIO
-                data = self.data.copy()
-                fib_rets = self.ret_list
-                buf = BytesIO()
-                # Generate the chart figure with Fibonacci levels using mplfinance.
-                fig, _ = mpf.plot(
-                    data[["Open", "High", "Low", "Close"]],
-                    type='candle',
-                    style='charles',
-                    figsize=(15, 8),
-                    title=f"{self.symbol} {self.timeframe} with Fibonacci ret. levels",
-                    hlines=fib_rets,
-                    returnfig=True
-                )
-                fig.savefig(buf, format='png')
-                buf.seek(0)
-                plt.close(fig)
-    
-                current_price = self.fetch_ticker()
-                current_time = pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S")
-                chart_caption = (
-                    "😎 *Here's your current chart!*\n\n"
-                    f"⏰ Current Time: {current_time}\n"
-                    f"💲 Ticker: {current_price}\n"
-                    f"🔖 Symbol: {self.symbol}\n"
-                    f"📊 Timeframe: {self.timeframe}"
-                )
-                await update.effective_message.reply_photo(buf, caption=chart_caption, parse_mode="Markdown")
+        tasks = []
+
+        async def post_init(application):
+            # Initial data fetch, then run the data refresh and alert strategy as tasks on the bot's loop.
+            await self.get_data()
+            tasks.append(asyncio.create_task(self._periodic(4 * 3600, self.get_data)))
+            tasks.append(asyncio.create_task(self._periodic(20, self.strategy)))
 
-            # /stop: Pause alerts.
-            async def stop_handler(update, context):
-                self.alerts_enabled = False
-                await update.effective_message.reply_text("👋 Alerts paused. Send /start to resume!", parse_mode="Markdown")
-    
-            # Handle inline keyboard button presses.
-            async def button_handler(update, context):
-                query = update.callback_query
-                await query.answer()  # Acknowledge the callback.
-                data = query.data
-                if data == "chart":
-                    await chart(update, context)
-                elif data == "help":
-                    await help_handler(update, context)
-                elif data == "stop":
-                    await stop_handler(update, context)
-
-            # Add handlers to the application.
-            application.add_handler(CommandHandler("start", start))
-            application.add_handler(CommandHandler("help", help_handler))
-            application.add_handler(CommandHandler("chart", chart))
-            application.add_handler(CommandHandler("stop", stop_handler))
-            application.add_handler(CallbackQueryHandler(button_handler))
-    
             # Register commands for Telegram.
             commands = [
                 BotCommand("start", "Start/resume alerts 😊"),
@@ -404,21 +470,128 @@ class fib_ao_strategy:
                 BotCommand("stop", "Pause alerts 🚫"),
             ]
             await application.bot.set_my_commands(commands)
-            await application.run_polling()
-    
-        asyncio.run(run_async())
-
 
-    def scheduler_loop(self):
+        async def post_shutdown(application):
+            for task in tasks:
+                task.cancel()
+            await self.ex.close()
+
+        application = (
+            Application.builder()
+            .token(self.bot.token)
+            .post_init(post_init)
+            .post_shutdown(post_shutdown)
+            .build()
+        )
+
+        # /start: Welcome message with menu inline keyboard.
+        async def start(update, context):
+            # Save the user's chat id for later alert messages.
+            self.chat_id = update.effective_message.chat_id
+            if not self.alerts_enabled:
+                self.alerts_enabled = True
+                await update.effective_message.reply_text("🚀 Alerts resumed!", parse_mode="Markdown")
+            else:
+                welcome_message = (
+                    "👋 Hello there! I'm your friendly market alert bot.\n\n"
+                    "What I can do:\n"
+                    "• Provide market data & alerts based on the Awesome Oscillator & Fibonacci levels 📈\n"
+                    "• Generate detailed candlestick charts enriched with Fibonacci retracement levels 🖼️\n"
+                    "• Display a current market snapshot including ticker, symbol, timeframe and time ⏰\n\n"
+                    "Select a command below:"
+                )
+                keyboard = [
+                    [InlineKeyboardButton("Chart 📈", callback_data="chart"),
+                     InlineKeyboardButton("Help 🧐", callback_data="help")],
+                    [InlineKeyboardButton("Stop 🚫", callback_data="stop")]
+                ]
+                reply_markup = InlineKeyboardMarkup(keyboard)
+                await update.effective_message.reply_text(welcome_message, parse_mode="Markdown", reply_markup=reply_markup)
+
+        # /help: Display help information.
+        async def help_handler(update, context):
+            help_text = (
+                "🤖 *Market Alert Bot Help:*\n\n"
+                "/start - Start/resume alerts and view available features 😊\n"
+                "/help - Show this help message and list features 🧐\n"
+                "/chart - Get the current market chart image 🖼️\n"
+                "/stop - Pause alerts 🚫\n\n"
+                "I'm here to fetch market data, compute technical indicators, and alert you when "
+                "conditions are met. Choose a button from the menu or type a command!"
+            )
+            keyboard = [
+                [InlineKeyboardButton("Chart 📈", callback_data="chart"),
+                 InlineKeyboardButton("Stop 🚫", callback_data="stop")]
+            ]
+            reply_markup = InlineKeyboardMarkup(keyboard)
+            await update.effective_message.reply_text(help_text, parse_mode="Markdown", reply_markup=reply_markup)
+
+        # /chart: Generate and send the current chart.
+        async def chart(update, context):
+            buf = BytesIO(self._render_chart_png())
+
+            current_price = await self.fetch_ticker()
+            current_time = pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S")
+            chart_caption = (
+                "😎 *Here's your current chart!*\n\n"
+                f"⏰ Current Time: {current_time}\n"
+                f"💲 Ticker: {current_price}\n"
+                f"🔖 Symbol: {self.symbol}\n"
+                f"📊 Timeframe: {self.timeframe}"
+            )
+            await update.effective_message.reply_photo(buf, caption=chart_caption, parse_mode="Markdown")
+
+        # /stop: Pause alerts.
+        async def stop_handler(update, context):
+            self.alerts_enabled = False
+            await update.effective_message.reply_text("👋 Alerts paused. Send /start to resume!", parse_mode="Markdown")
+
+        # Handle inline keyboard button presses.
+        async def button_handler(update, context):
+            query = update.callback_query
+            await query.answer()  # Acknowledge the callback.
+            data = query.data
+            if data == "chart":
+                await chart(update, context)
+            elif data == "help":
+                await help_handler(update, context)
+            elif data == "stop":
+                await stop_handler(update, context)
+
+        # Add handlers to the application.
+        application.add_handler(CommandHandler("start", start))
+        application.add_handler(CommandHandler("help", help_handler))
+        application.add_handler(CommandHandler("chart", chart))
+        application.add_handler(CommandHandler("stop", stop_handler))
+        application.add_handler(CallbackQueryHandler(button_handler))
+
+        application.run_polling()
+
+
+    async def _periodic(self, interval, job):
         """
-        Continuously check and run any scheduled tasks.
+        Run a coroutine job repeatedly on the bot's event loop.
 
-        Uses the schedule library to run tasks that have been scheduled (such as data fetching
-        and strategy evaluation). Sleeps briefly between checks to avoid excessive CPU usage.
+        Runs are kept on a fixed cadence: the task sleeps exactly until the next due time,
+        so the time spent inside a run does not push later runs back, and runs missed while
+        a slow one was in progress are skipped rather than fired back to back. A failing run
+        is reported and the loop carries on with the next one.
+
+        :param interval: Seconds between the start of consecutive runs.
+        :param job: Coroutine function to run, e.g. self.get_data or self.strategy.
         """
+        loop = asyncio.get_running_loop()
+        next_run = loop.time() + interval
         while True:
-            schedule.run_pending()
-            time.sleep(2)
+            await asyncio.sleep(max(0.0, next_run - loop.time()))
+            try:
+                await job()
+            except Exception as e:
+                print(f"❌ Failed: {e}")
+            next_run += interval
+            if next_run < loop.time():
+                # Skip runs that were missed while this one was in progress.
+                next_run += ((loop.time() - next_run) // interval + 1) * interval
 
     def run(self):
         """
@@ -426,26 +599,12 @@ class fib_ao_strategy:
         and the Telegram bot interface.
 
         Workflow:
-          - Perform an initial data fetch and compute indicators.
-          - Clear any existing schedules and set up new recurring tasks:
-              • Update market data every 4 seconds.
-              • Run the alert strategy every 10 seconds.
-          - Launch both the Telegram bot and the scheduler in separate daemon threads.
-          - Wait for both threads to run indefinitely.
+          - Launch the Telegram bot, which performs the initial data fetch on its event loop.
+          - Schedule recurring tasks on the same loop:
+              • Update market data every 4 hours.
+              • Run the alert strategy every 20 seconds.
         """
-        # Initial data fetch and indicator calculations.
-        self.get_data()
-        schedule.clear()
-        schedule.every(4).hours.do(self.get_data)
-        schedule.every(20).seconds.do(lambda: self.strategy())
-
-        # Use threading to run the bot and the scheduler concurrently.
-        scheduler_thread = threading.Thread(target=self.scheduler_loop, daemon=True)
         self.start_bot()
-        scheduler_thread.start()
-
-        bot_thread.join()
-        scheduler_thread.join()
 
 
 # Instantiate and run the bot.